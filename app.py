@@ -1,33 +1,57 @@
 """Contains the Flask app and module-loading logic"""
 
 import importlib.util
-import inspect
-import glob
 import os
-from pathlib import Path
 import sys
-from typing import List
+import threading
+from typing import Callable, Dict, List, Optional, Type
 
-from flask import abort, Flask, request
+from flask import abort, Flask, request, Response
 
-from scim_system import SCIMSystem
+from scim_system import HTTP_METHODS, is_implemented, LOWERCASE_ENDPOINTS, SCIMSystem
 
 app = Flask(__name__)
 
+SYSTEM_DIR = os.path.join(os.getcwd(), "systems")
+
+# Defined in RFC 7644 § 3.1
+SCIM_CONTENT_TYPE = "application/scim+json"
+
+# Stems of the files in "./systems/", each mapped to itself so a system name from
+# a request can be swapped for the interned stem. Rebuilt only when the directory
+# changes.
+_system_stems: Dict[str, str] = {}
+_system_dir_mtime: Optional[float] = None
+
+# SCIMSystem subclasses that have already been loaded, keyed by system name
+_system_classes: Dict[str, Type[SCIMSystem]] = {}
+_system_classes_lock = threading.Lock()
+
+# The single, shared instance of each system's SCIMSystem subclass
+_system_instances: Dict[str, SCIMSystem] = {}
+
+# Lowercase names for the HTTP methods, keyed by how they normally arrive, so the
+# common case doesn't allocate a new string per request
+_LOWERCASE_METHODS = {method.upper(): method for method in HTTP_METHODS}
+
 
 def get_system_file(system_name: str) -> str:
     """Gets the corresponding .py file, based on a system name"""
-    cwd = os.getcwd()
-    system_dir = cwd + "/systems"
-    system_file = f"{system_dir}/{system_name}.py"
+    system_file = f"{SYSTEM_DIR}/{system_name}.py"
     return system_file
 
 
 def load_module(system_name: str) -> str:
-    """Loads the module designated by the system name"""
-    system_file = get_system_file(system_name)
+    """Loads the module designated by the system name.
+    The module body only runs when one of its attributes is first accessed,
+    so a system's own imports aren't paid for until it's used.
+    """
     module_name = f"systems.{system_name}"
+    if module_name in sys.modules:
+        return module_name
+    system_file = get_system_file(system_name)
     spec = importlib.util.spec_from_file_location(module_name, system_file)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
     module = importlib.util.module_from_spec(spec)
     sys.modules[module_name] = module
     spec.loader.exec_module(module)
@@ -38,76 +62,153 @@ class SystemSubclassMissing(Exception):
     """If an imported "systems" module doesn't have a subclass of SCIMSystem"""
 
     def __init__(self, module_name):
-        self.message = f'Module "{module_name}" is missing a subclass of System'
+        super().__init__(f'Module "{module_name}" is missing a subclass of System')
 
 
 def get_system_subclass(module_name: str):
     """Checks if the named module contains a subclass of SCIMSystem"""
     module = sys.modules[module_name]
-    for _, module_member in inspect.getmembers(module):
-        if not inspect.isclass(module_member):
+    for module_member in vars(module).values():
+        if not isinstance(module_member, type):
             continue
-        if module_member == SCIMSystem:
+        if module_member is SCIMSystem:
             continue
         if issubclass(module_member, SCIMSystem):
             return module_member
     raise SystemSubclassMissing(module_name)
 
 
-@app.route("/<string:system_name>/<string:endpoint>")
-def scim_endpoint(system_name: str, endpoint: str):
-    """Represents all SCIM endpoints, with a system-name prefix"""
-    if not system_name_exists(system_name):
+@app.route("/<path:scim_path>", methods=[method.upper() for method in HTTP_METHODS])
+def scim_endpoint(scim_path: str):
+    """Represents all SCIM endpoints, with a system-name prefix.
+    The path is split by hand instead of through a two-converter route rule.
+    """
+    path_parts = scim_path.split("/")
+    if len(path_parts) != 2:
         abort(404)
-    module_name = load_module(system_name)
-    target_subclass = get_system_subclass(module_name)
-    inst = target_subclass()
-    try:
-        return call_method_and_endpoint_on_obj(request.method, endpoint, inst)
-    except AttributeError:
+    system_name, endpoint = path_parts
+    target_subclass = get_system_class(system_name)
+    if target_subclass is None:
         abort(404)
+    handler = get_handler_for_request(request.method, endpoint, target_subclass)
+    if handler is None:
+        abort(404)
+    if not is_implemented(handler):
+        abort(501)
+    inst = get_system_instance(system_name)
+    try:
+        response_body = handler(inst)
     except NotImplementedError:
         abort(501)
+    if isinstance(response_body, bytes):
+        return Response(response_body, content_type=SCIM_CONTENT_TYPE)
+    return response_body
 
 
-def system_name_exists(system_name: str) -> bool:
-    """Confirm a file for the system name exists"""
-    system_files = get_system_files()
-    file_name_stems = [Path(f).stem for f in system_files]
-    if system_name not in file_name_stems:
-        return False
-    return True
-
-
-def get_system_files() -> List[str]:
-    """Gets the list of all Python files in the "./systems/" directory"""
-    cwd = os.getcwd()
-    system_dir = cwd + "/systems"
-    system_files = glob.glob(system_dir + "/*.py")
-    return system_files
+def get_system_class(system_name: str) -> Optional[Type[SCIMSystem]]:
+    """Gets the SCIMSystem subclass for the system name,
+    only loading its module the first time it is requested.
+    Returns None if there is no file for the system name.
+    """
+    system_class = _system_classes.get(system_name)
+    if system_class is not None:
+        return system_class
+    # Cache under the interned stem rather than the request's copy of the name
+    system_name = get_system_stems().get(system_name)
+    if system_name is None:
+        return None
+    with _system_classes_lock:
+        system_class = _system_classes.get(system_name)
+        if system_class is None:
+            module_name = load_module(system_name)
+            try:
+                system_class = get_system_subclass(module_name)
+            except Exception:
+                # The lazy module body failed partway. Drop it so the next
+                # request imports it again and reports the real error.
+                sys.modules.pop(module_name, None)
+                raise
+            _system_classes[system_name] = system_class
+    return system_class
+
+
+def get_system_instance(system_name: str) -> SCIMSystem:
+    """Gets the instance of the system's SCIMSystem subclass shared by all requests"""
+    inst = _system_instances.get(system_name)
+    if inst is None:
+        inst = _system_instances.setdefault(
+            get_system_stems().get(system_name, system_name),
+            get_system_class(system_name)(),
+        )
+    return inst
+
+
+def get_system_stems() -> Dict[str, str]:
+    """Gets the stems of all system files, only re-scanning the "./systems/"
+    directory when its modification time has changed
+    """
+    global _system_stems, _system_dir_mtime
+    try:
+        mtime = os.stat(SYSTEM_DIR).st_mtime
+    except FileNotFoundError:  # No systems directory means there are no systems
+        _system_stems = {}
+        _system_dir_mtime = None
+        return _system_stems
+    if mtime != _system_dir_mtime:
+        _system_stems = {stem: stem for stem in get_system_names()}
+        _system_dir_mtime = mtime
+    return _system_stems
+
+
+def load_all_systems():
+    """Lazily loads every system in the "./systems/" directory up front.
+    Each system's module body runs, and its class is cached,
+    on the first request for that system.
+    """
+    for system_name in get_system_stems():
+        load_module(system_name)
 
 
-def call_method_and_endpoint_on_obj(
-    method: str, endpoint: str, scim_system_obj: SCIMSystem
-):
-    """Given a method and a SCIM endpoint,
-    calls the correspending method on the SCIMSystem object
+def get_system_names() -> List[str]:
+    """Gets the names (minus the .py) of all Python files in the "./systems/" directory.
+    The names are interned since they key the system caches.
+    """
+    with os.scandir(SYSTEM_DIR) as entries:
+        return [
+            sys.intern(entry.name[:-3])
+            for entry in entries
+            if entry.name.endswith(".py") and entry.is_file()
+        ]
+
+
+def get_handler_for_request(
+    method: str, endpoint: str, scim_system_class: Type[SCIMSystem]
+) -> Optional[Callable]:
+    """Given a method and a SCIM endpoint, returns the corresponding
+    function on the SCIMSystem subclass, or None if there isn't one
     """
     method = get_lowercase_method(method)
     endpoint = get_endpoint(endpoint)
-    function_method_to_call = getattr(scim_system_obj, f"{method}_{endpoint}")
-    return function_method_to_call()
+    return scim_system_class.get_handler(method, endpoint)
 
 
 def get_lowercase_method(method: str) -> str:
     """Returns the lowercase name of the HTTP method"""
-    return method.lower()
+    lowercase_method = _LOWERCASE_METHODS.get(method)
+    if lowercase_method is None:
+        return method.lower()
+    return lowercase_method
 
 
 def get_endpoint(endpoint: str) -> str:
     """Returns the lowercase name of the SCIM endpoint"""
-    return endpoint.strip("/").lower()
+    lowercase_endpoint = LOWERCASE_ENDPOINTS.get(endpoint)
+    if lowercase_endpoint is None:
+        return endpoint.lower()
+    return lowercase_endpoint
+
 
+load_all_systems()
 
 if __name__ == "__main__":
     app.run()
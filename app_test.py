@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import app
+
+
+class TestApp(unittest.TestCase):
+    def setUp(self):
+        self.client = app.app.test_client()
+
+    def test_get_users(self):
+        response = self.client.get("/example/Users")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content_type, "application/scim+json")
+        list_response = response.get_json(force=True)
+        self.assertEqual(list_response["totalResults"], 1)
+        self.assertEqual(list_response["Resources"][0]["userName"], "bob")
+
+    def test_caches_keyed_by_stem(self):
+        self.client.get("/" + "".join(["exam", "ple"]) + "/Users")
+        stem = app.get_system_stems()["example"]
+
+        for cache in (app._system_classes, app._system_instances):
+            self.assertIs(next(name for name in cache if name == "example"), stem)
+
+    def test_unknown_system(self):
+        response = self.client.get("/unknown/Users")
+        self.assertEqual(response.status_code, 404)
+
+    def test_unknown_endpoint(self):
+        response = self.client.get("/example/Unknown")
+        self.assertEqual(response.status_code, 404)
+
+    def test_unimplemented_endpoint(self):
+        response = self.client.post("/example/Groups")
+        self.assertEqual(response.status_code, 501)
+
+    def test_missing_system_dir(self):
+        with mock.patch.object(app, "SYSTEM_DIR", "/nonexistent/systems"):
+            self.assertEqual(app.get_system_stems(), {})
+            self.assertEqual(self.client.get("/unknown/Users").status_code, 404)
+        self.assertIn("example", app.get_system_stems())
+
+    def test_broken_system_reports_its_error(self):
+        with tempfile.TemporaryDirectory() as system_dir:
+            with open(os.path.join(system_dir, "broken.py"), "w") as system_file:
+                system_file.write('raise RuntimeError("boom")\n')
+            with mock.patch.object(app, "SYSTEM_DIR", system_dir):
+                try:
+                    for _ in range(2):
+                        with self.assertRaisesRegex(RuntimeError, "boom"):
+                            app.get_system_class("broken")
+                finally:
+                    sys.modules.pop("systems.broken", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,92 +1,169 @@
 """Holds the base class for the SCIM system"""
 
-
-def _create_error_text(method: str, endpoint: str) -> str:
-    return f"The {method} method is not implemented for {endpoint}"
-
-
-class SCIMSystem:
-    """Represents a system behind the SCIM 2.0 interface.
-    Methods are named according to to RFC7644 section 3.2 and follow the pattern:
-    <HTTP method>_<SCIM endpoint>
+import functools
+from typing import Callable, Dict, Final, FrozenSet, Optional, Tuple
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+
+# Maps each lowercase SCIM endpoint, as it appears in a URL,
+# to the suffix of the SCIMSystem methods that handle it
+ENDPOINT_METHOD_SUFFIXES = {
+    "users": "users",
+    "groups": "groups",
+    "me": "me",
+    "serviceproviderconfig": "service_provider_config",
+    "resourcetypes": "resource_types",
+    "schemas": "schemas",
+    "bulk": "bulk",
+    ".search": "search",
+}
+
+
+_IMPLEMENTABLE_ENDPOINTS = [
+    ("GET", "/Users"),
+    ("POST", "/Users"),
+    ("PUT", "/Users"),
+    ("PATCH", "/Users"),
+    ("DELETE", "/Users"),
+    ("GET", "/Groups"),
+    ("POST", "/Groups"),
+    ("PUT", "/Groups"),
+    ("PATCH", "/Groups"),
+    ("DELETE", "/Groups"),
+    ("GET", "/Me"),
+    ("POST", "/Me"),
+    ("PUT", "/Me"),
+    ("PATCH", "/Me"),
+    ("DELETE", "/Me"),
+    ("GET", "/ServiceProviderConfig"),
+    ("GET", "/ResourceTypes"),
+    ("GET", "/Schemas"),
+    ("POST", "/Bulk"),
+    ("POST", "/.search"),
+]
+
+# Maps each usual spelling of a SCIM endpoint in a URL, lowercase or as written in
+# RFC 7644, to its lowercase name, so the common case needs no str.lower()
+LOWERCASE_ENDPOINTS: Final[Dict[str, str]] = {
+    endpoint: endpoint for endpoint in ENDPOINT_METHOD_SUFFIXES
+}
+LOWERCASE_ENDPOINTS.update(
+    {
+        endpoint.strip("/"): LOWERCASE_ENDPOINTS[endpoint.strip("/").lower()]
+        for _, endpoint in _IMPLEMENTABLE_ENDPOINTS
+    }
+)
+
+_ERROR_TEXT: Final[Dict[Tuple[str, str], str]] = {
+    (method, endpoint): f"The {method} method is not implemented for {endpoint}"
+    for method, endpoint in _IMPLEMENTABLE_ENDPOINTS
+}
+
+
+def _get_method_name(method: str, endpoint: str) -> str:
+    """Returns the SCIMSystem method name for an HTTP method and SCIM endpoint,
+    e.g. "GET" and "/ServiceProviderConfig" -> "get_service_provider_config"
     """
+    suffix = ENDPOINT_METHOD_SUFFIXES[endpoint.strip("/").lower()]
+    return f"{method.lower()}_{suffix}"
 
-    def get_users(self):
-        """GET /Users"""
-        raise NotImplementedError(_create_error_text("GET", "/Users"))
-
-    def post_users(self):
-        """POST /Users"""
-        raise NotImplementedError(_create_error_text("POST", "/Users"))
-
-    def put_users(self):
-        """PUT /Users"""
-        raise NotImplementedError(_create_error_text("PUT", "/Users"))
-
-    def patch_users(self):
-        """PATCH /Users"""
-        raise NotImplementedError(_create_error_text("PATCH", "/Users"))
 
-    def delete_users(self):
-        """DELETE /Users"""
-        raise NotImplementedError(_create_error_text("DELETE", "/Users"))
-
-    def get_groups(self):
-        """GET /Groups"""
-        raise NotImplementedError(_create_error_text("GET", "/Groups"))
-
-    def post_groups(self):
-        """POST /Groups"""
-        raise NotImplementedError(_create_error_text("POST", "/Groups"))
+def _make_not_implemented_stub(message: str) -> Callable:
+    """Returns a function raising NotImplementedError with the prebuilt message.
+    A new exception is raised each time, so no traceback or context is shared
+    between requests or threads.
+    """
 
-    def put_groups(self):
-        """PUT /Groups"""
-        raise NotImplementedError(_create_error_text("PUT", "/Groups"))
+    def not_implemented(*args, **kwargs):
+        raise NotImplementedError(message)
 
-    def patch_groups(self):
-        """PATCH /Groups"""
-        raise NotImplementedError(_create_error_text("PATCH", "/Groups"))
+    return not_implemented
 
-    def delete_groups(self):
-        """DELETE /Groups"""
-        raise NotImplementedError(_create_error_text("DELETE", "/Groups"))
 
-    def get_me(self):
-        """GET /Me"""
-        raise NotImplementedError(_create_error_text("GET", "/Me"))
+# Stand-ins for the methods a subclass can implement, keyed by method name
+_NOT_IMPLEMENTED_STUBS: Final[Dict[str, Callable]] = {
+    _get_method_name(method, endpoint): _make_not_implemented_stub(
+        _ERROR_TEXT[method, endpoint]
+    )
+    for method, endpoint in _IMPLEMENTABLE_ENDPOINTS
+}
+_NOT_IMPLEMENTED_HANDLERS: Final[FrozenSet[Callable]] = frozenset(
+    _NOT_IMPLEMENTED_STUBS.values()
+)
 
-    def post_me(self):
-        """POST /Me"""
-        raise NotImplementedError(_create_error_text("POST", "/Me"))
 
-    def put_me(self):
-        """PUT /Me"""
-        raise NotImplementedError(_create_error_text("PUT", "/Me"))
+def is_implemented(handler: Callable) -> bool:
+    """Returns whether a handler from SCIMSystem.get_handler is implemented by the
+    subclass, so callers can skip calling it just to catch NotImplementedError
+    """
+    return handler not in _NOT_IMPLEMENTED_HANDLERS
 
-    def patch_me(self):
-        """PATCH /Me"""
-        raise NotImplementedError(_create_error_text("PATCH", "/Me"))
 
-    def delete_me(self):
-        """DELETE /Me"""
-        raise NotImplementedError("DELETE", "/Me")
+class SCIMSystem:
+    """Represents a system behind the SCIM 2.0 interface.
+    Methods are named according to to RFC7644 section 3.2 and follow the pattern:
+    <HTTP method>_<SCIM endpoint>
+    e.g. get_users or get_service_provider_config.
+    Any of these methods a subclass doesn't define raises NotImplementedError.
+    Methods return the response body as UTF-8 JSON bytes, e.g. from
+    scim_utilities.dump_json, which are sent as-is with the SCIM content type.
+    A single instance of each subclass is shared by every request.
+    """
 
-    def get_service_provider_config(self):
-        """GET /ServiceProviderConfig"""
-        raise NotImplementedError("GET", "/ServiceProviderConfig")
+    _dispatch_table: Dict[Tuple[str, str], Callable] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch_table = {}
+        for method in HTTP_METHODS:
+            for endpoint, suffix in ENDPOINT_METHOD_SUFFIXES.items():
+                method_name = f"{method}_{suffix}"
+                handler = getattr(cls, method_name, None)
+                if handler is None:
+                    handler = _NOT_IMPLEMENTED_STUBS.get(method_name)
+                if handler is not None:
+                    cls._dispatch_table[method, endpoint] = handler
+
+    def __getattr__(self, name: str) -> Callable:
+        """Returns a stand-in raising NotImplementedError for SCIM methods the
+        subclass doesn't define. Only called when normal lookup fails, so
+        implemented methods never reach it.
+        """
+        stub = _NOT_IMPLEMENTED_STUBS.get(name)
+        if stub is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        return stub
+
+    @classmethod
+    def get_handler(cls, method: str, endpoint: str) -> Optional[Callable]:
+        """Returns the function handling the lowercase HTTP method and SCIM endpoint,
+        or None if there isn't one
+        """
+        return cls._dispatch_table.get((method, endpoint))
+
+
+def cached_response(version_attribute: str) -> Callable:
+    """Decorates a SCIMSystem method so its response is reused until the system's
+    version_attribute changes. Methods that change the data the response is built
+    from, e.g. post_users, should bump it, e.g. self.users_version += 1.
+    """
 
-    def get_resource_types(self):
-        """GET /ResourceTypes"""
-        raise NotImplementedError("GET", "/ResourceTypes")
+    def decorator(method: Callable) -> Callable:
+        cache_name = f"_cached_{method.__name__}"
 
-    def get_schemas(self):
-        """GET /Schemas"""
-        raise NotImplementedError("GET", "/Schemas")
+        @functools.wraps(method)
+        def wrapper(self):
+            version = getattr(self, version_attribute)
+            # Read from __dict__ so a miss doesn't fall through to __getattr__
+            cached = self.__dict__.get(cache_name)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            response = method(self)
+            self.__dict__[cache_name] = (version, response)
+            return response
 
-    def post_bulk(self):
-        """POST /Bulk"""
-        raise NotImplementedError("POST", "/Bulk")
+        return wrapper
 
-    def post_search(self):
-        """POST /.search"""
-        raise NotImplementedError("POST", "/.search")
+    return decorator
@@ -0,0 +1,67 @@
+import unittest
+
+import scim_system
+
+
+class ExampleSystem(scim_system.SCIMSystem):
+    def get_users(self):
+        return "users"
+
+
+class TestSCIMSystem(unittest.TestCase):
+    def test_get_handler(self):
+        handler = ExampleSystem.get_handler("get", "users")
+        self.assertEqual(handler(ExampleSystem()), "users")
+
+    def test_get_handler_multi_word_endpoint(self):
+        handler = ExampleSystem.get_handler("get", "serviceproviderconfig")
+        with self.assertRaisesRegex(NotImplementedError, "/ServiceProviderConfig"):
+            handler(ExampleSystem())
+
+    def test_is_implemented(self):
+        self.assertTrue(
+            scim_system.is_implemented(ExampleSystem.get_handler("get", "users"))
+        )
+        self.assertFalse(
+            scim_system.is_implemented(ExampleSystem.get_handler("get", "groups"))
+        )
+
+    def test_get_handler_unknown_endpoint(self):
+        self.assertIsNone(ExampleSystem.get_handler("get", "unknown"))
+
+    def test_unimplemented_method(self):
+        with self.assertRaisesRegex(
+            NotImplementedError, "The GET method is not implemented for /Groups"
+        ):
+            ExampleSystem().get_groups()
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            ExampleSystem().get_unknown
+
+
+class CachedSystem(scim_system.SCIMSystem):
+    users_version = 0
+    calls = 0
+
+    @scim_system.cached_response("users_version")
+    def get_users(self):
+        self.calls += 1
+        return f"users {self.users_version}"
+
+
+class TestCachedResponse(unittest.TestCase):
+    def test_cached_until_version_changes(self):
+        system = CachedSystem()
+
+        self.assertEqual(system.get_users(), "users 0")
+        self.assertEqual(system.get_users(), "users 0")
+        self.assertEqual(system.calls, 1)
+
+        system.users_version += 1
+        self.assertEqual(system.get_users(), "users 1")
+        self.assertEqual(system.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
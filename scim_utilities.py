@@ -1,25 +1,183 @@
+from dataclasses import dataclass, field, fields
 from enum import Enum
+import functools
+from itertools import islice
 import json
 import re
-from typing import Any, List, Dict, Union
+import sys
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Final,
+    Iterable,
+    List,
+    Dict,
+    NotRequired,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+)
 from warnings import warn
 
 
-# class ListResponse:
-#     def __init__(self, resources):
-#         self.list_response = create_base_list_response(resources)
+def _encode_resource(obj: Any) -> Dict[str, Any]:
+    """The default hook for dump_json, encoding SCIMResources it finds in obj"""
+    if isinstance(obj, SCIMResource):
+        return obj.json_encode()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
-# def create_base_list_response(resources: List[Any]) -> Dict[Any]:
-#     list_response = {
-#         "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
-#         "totalResults": len(resources),
-#         "Resources": resources,
-#     }
-#     return list_response
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
 
+    def dump_json(obj: Any) -> bytes:
+        """Serializes obj to compact UTF-8 JSON"""
+        return json.dumps(obj, separators=(",", ":"), default=_encode_resource).encode()
 
-class AttributeType(Enum):
+else:
+    # Dataclasses are passed through so resources go to their own json_encode
+    dump_json = functools.partial(
+        orjson.dumps,
+        default=_encode_resource,
+        option=orjson.OPT_PASSTHROUGH_DATACLASS,
+    )
+
+
+# Interned, so other interned copies of the URN are this same string
+_LIST_RESPONSE_URN: Final = sys.intern(
+    "urn:ietf:params:scim:api:messages:2.0:ListResponse"
+)
+_LIST_RESPONSE_SCHEMAS: Final = (_LIST_RESPONSE_URN,)
+
+
+class ListResponse(TypedDict):
+    """A ListResponse message, defined in RFC 7644 § 3.4.2"""
+
+    schemas: Tuple[str, ...]
+    totalResults: int
+    itemsPerPage: NotRequired[int]  # Only in paginated responses, as is startIndex
+    startIndex: NotRequired[int]
+    Resources: Iterable[Any]
+
+
+# Copied for each ListResponse, which is quicker than building the dict from scratch
+_LIST_RESPONSE_TEMPLATE: Final = {
+    "schemas": _LIST_RESPONSE_SCHEMAS,
+    "totalResults": 0,
+    "Resources": None,
+}
+
+
+_PAGED_LIST_RESPONSE_TEMPLATE: Final = {
+    "schemas": _LIST_RESPONSE_SCHEMAS,
+    "totalResults": 0,
+    "itemsPerPage": 0,
+    "startIndex": 1,
+    "Resources": None,
+}
+
+
+def _get_page_bounds(
+    start_index: Optional[int], count: Optional[int]
+) -> Tuple[int, int, Optional[int]]:
+    """Returns the 1-based start index, and the 0-based start and stop to pass
+    to islice, for a SCIM startIndex and count. As in RFC 7644 § 3.4.2.4,
+    a startIndex below 1 is read as 1 and a negative count as 0.
+    """
+    if start_index is None or start_index < 1:
+        start_index = 1
+    start = start_index - 1
+    if count is None:
+        return start_index, start, None
+    return start_index, start, start + max(count, 0)
+
+
+def create_base_list_response(
+    resources: Iterable[Any],
+    total: Optional[int] = None,
+    *,
+    start_index: Optional[int] = None,
+    count: Optional[int] = None,
+) -> ListResponse:
+    """Wraps resources in a ListResponse.
+    totalResults is total if given, e.g. for one page of a larger result set,
+    and otherwise the number of resources. Resources without a length, like
+    generators, are collected into a tuple so they can be counted and encoded.
+    start_index and count are SCIM's 1-based startIndex and count, selecting a
+    page of resources. The response then has the startIndex and itemsPerPage
+    that RFC 7644 § 3.4.2 requires, and totalResults still counts all of them.
+    """
+    # Collected even when total is given, since JSON encoders can't encode iterators
+    if not hasattr(resources, "__len__"):
+        resources = tuple(resources)
+    if total is None:
+        total = len(resources)
+    if start_index is None and count is None:
+        list_response = _LIST_RESPONSE_TEMPLATE.copy()
+    else:
+        start_index, start, stop = _get_page_bounds(start_index, count)
+        # islice rather than slicing, which sized inputs like sets don't support
+        resources = tuple(islice(resources, start, stop))
+        list_response = _PAGED_LIST_RESPONSE_TEMPLATE.copy()
+        list_response["itemsPerPage"] = len(resources)
+        list_response["startIndex"] = start_index
+    list_response["totalResults"] = total
+    list_response["Resources"] = resources
+    return list_response
+
+
+# The ListResponse JSON with the resource count and the resources left to fill in
+_LIST_RESPONSE_JSON_TEMPLATE: Final = (
+    b'{"schemas":'
+    + dump_json(_LIST_RESPONSE_SCHEMAS)
+    + b',"totalResults":%d,"Resources":[%b]}'
+)
+# The same for a page of resources, which also needs itemsPerPage and startIndex
+_PAGED_LIST_RESPONSE_JSON_TEMPLATE: Final = (
+    b'{"schemas":'
+    + dump_json(_LIST_RESPONSE_SCHEMAS)
+    + b',"totalResults":%d,"itemsPerPage":%d,"startIndex":%d,"Resources":[%b]}'
+)
+
+
+def dump_list_response_json(
+    resources: Iterable["SCIMResource"],
+    total: Optional[int] = None,
+    *,
+    start_index: Optional[int] = None,
+    count: Optional[int] = None,
+) -> bytes:
+    """Returns resources wrapped in a ListResponse, serialized to JSON.
+    Only the resources are serialized; the rest comes from a prebuilt template.
+    total, start_index and count are used as in create_base_list_response, except
+    the page is read straight from resources rather than copied out of them,
+    unless they have no length and need counting.
+    """
+    if start_index is None and count is None:
+        resource_json = [resource.dump_json() for resource in resources]
+        if total is None:
+            total = len(resource_json)
+        return _LIST_RESPONSE_JSON_TEMPLATE % (total, b",".join(resource_json))
+    if total is None:
+        if not hasattr(resources, "__len__"):
+            resources = tuple(resources)
+        total = len(resources)
+    start_index, start, stop = _get_page_bounds(start_index, count)
+    resource_json = [
+        resource.dump_json() for resource in islice(resources, start, stop)
+    ]
+    return _PAGED_LIST_RESPONSE_JSON_TEMPLATE % (
+        total,
+        len(resource_json),
+        start_index,
+        b",".join(resource_json),
+    )
+
+
+class AttributeType(str, Enum):
     """The schema attribute type"""
 
     STRING = "string"
@@ -31,7 +189,7 @@ class AttributeType(Enum):
     COMPLEX = "complex"
 
 
-class Mutability(Enum):
+class Mutability(str, Enum):
     """The schema attribute mutability"""
 
     READ_ONLY = "readOnly"
@@ -40,7 +198,7 @@ class Mutability(Enum):
     WRITE_ONLY = "writeOnly"
 
 
-class Returned(Enum):
+class Returned(str, Enum):
     """The schema attribute returned value"""
 
     ALWAYS = "always"
@@ -49,13 +207,13 @@ class Returned(Enum):
     REQUEST = "request"
 
 
-class Uniqueness(Enum):
+class Uniqueness(str, Enum):
     NONE = "none"
     SERVER = "server"
     GLOBAL = "global"
 
 
-class ReferenceTypes(Enum):
+class ReferenceTypes(str, Enum):
     # FIXME - This isn't right. Need to be able to house values
     USER = "User"
     GROUP = "Group"
@@ -66,415 +224,384 @@ class ReferenceTypes(Enum):
 class SCIMViolation(Exception):
     """Exception raised for a violation of the SCIM standard"""
 
-    def __init__(self, message):
-        self.message = message
+
+def _intern(value: Any) -> Any:
+    """Interns value if it's exactly a str. sys.intern rejects str subclasses,
+    like the str enums, so those are returned unchanged.
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+# Names of complex attributes already warned about for missing sub-attributes,
+# so each name only pays for warn()'s stack walk once
+_warned_complex_attribute_names = set()
 
 
+@dataclass(frozen=True, kw_only=True, slots=True)
 class SchemaAttribute:
     """Defined in https://datatracker.ietf.org/doc/html/rfc7643#section-7
     Default values defined in RFC 7643 § 2.2
     """
 
-    def __init__(
-        self,
-        *,
-        name: str,
-        type: AttributeType = AttributeType.STRING,
-        sub_attributes: List["SchemaAttribute"] = None,  # Only if "type" == "complex"
-        multi_valued: bool,
-        description: str,
-        required: bool = False,
-        canonical_values: List[str] = None,
-        case_exact: bool = False,
-        mutability: Mutability = Mutability.READ_WRITE,
-        returned: Returned = Returned.DEFAULT,
-        uniqueness: Uniqueness = Uniqueness.NONE,
-        reference_types: ReferenceTypes = None,  # Only if "type" == "reference"
-    ):
-
-        self.name = name
-        self.type = type
-        self.sub_attributes = sub_attributes
-        self.multi_valued = multi_valued
-        self.description = description
-        self.requred = required
-        self.canonical_values = canonical_values
-        self.case_exact = case_exact
-        self.mutability = mutability
-        self.returned = returned
-        self.uniqueness = uniqueness
-        self.reference_types = reference_types
-
+    name: str
+    type: AttributeType = AttributeType.STRING
+    sub_attributes: Tuple["SchemaAttribute", ...] = None  # Only if "type" == "complex"
+    multi_valued: bool
+    description: str
+    required: bool = False
+    canonical_values: Tuple[str, ...] = None
+    case_exact: bool = False
+    mutability: Mutability = Mutability.READ_WRITE
+    returned: Returned = Returned.DEFAULT
+    uniqueness: Uniqueness = Uniqueness.NONE
+    reference_types: ReferenceTypes = None  # Only if "type" == "reference"
+    # Set by the first dump_obj call; the attribute is immutable, so it's reused
+    _dumped: Dict[str, Any] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._freeze_sub_attributes()
+        self._intern_names()
         self._warn_on_complex_type_missing_sub_attributes()
         self._throw_exception_on_sub_attributes_but_not_complex_type()
 
+    def _freeze_sub_attributes(self):
+        # Stored as a tuple so the frozen attribute stays immutable and hashable
+        if self.sub_attributes is not None:
+            object.__setattr__(self, "sub_attributes", tuple(self.sub_attributes))
+
+    def _intern_names(self):
+        # Attribute names and canonical values are a small set of strings
+        # used over and over as keys and in comparisons
+        object.__setattr__(self, "name", _intern(self.name))
+        if self.canonical_values is not None:
+            object.__setattr__(
+                self,
+                "canonical_values",
+                tuple(_intern(value) for value in self.canonical_values),
+            )
+
     def _warn_on_complex_type_missing_sub_attributes(self):
-        if self.type == AttributeType.COMPLEX and self.sub_attributes == None:
+        if self.sub_attributes is None and self.type == AttributeType.COMPLEX:
+            if self.name in _warned_complex_attribute_names:
+                return
+            _warned_complex_attribute_names.add(self.name)
             warn(
                 f'Attribute "{self.name}" has the type "complex", but is missing sub-attributes. This is recommended per RFC 7643 § 7.'
             )
 
     def _throw_exception_on_sub_attributes_but_not_complex_type(self):
-        if self.type != AttributeType.COMPLEX and self.sub_attributes != None:
+        if self.sub_attributes is not None and self.type != AttributeType.COMPLEX:
             raise SCIMViolation(
                 f'Attribute "{self.name}" has sub-attributes, but is not of type "complex"'
             )
 
-
+    def dump_obj(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable representation of the attribute.
+        It's built on the first call and shared between calls; callers must not
+        modify it.
+        """
+        if self._dumped is not None:
+            return self._dumped
+        dumped = {
+            "name": self.name,
+            "type": self.type,
+            "multiValued": self.multi_valued,
+            "description": self.description,
+            "required": self.required,
+        }
+        if self.canonical_values is not None:
+            dumped["canonicalValues"] = self.canonical_values
+        dumped["caseExact"] = self.case_exact
+        dumped["mutability"] = self.mutability
+        dumped["returned"] = self.returned
+        dumped["uniqueness"] = self.uniqueness
+        if self.reference_types is not None:
+            dumped["referenceTypes"] = self.reference_types
+        if self.sub_attributes is not None:
+            dumped["subAttributes"] = [
+                sub_attribute.dump_obj() for sub_attribute in self.sub_attributes
+            ]
+        object.__setattr__(self, "_dumped", dumped)
+        return dumped
+
+
+@dataclass(kw_only=True, slots=True)
 class SCIMSchema:
     """An abstract representation of a SCIM schema. Not to be confused with the "Schema" resource."""
 
-    def __init__(
-        self, *, id: str, name: str, description: str, attributes: List[SchemaAttribute]
-    ):
-        self.id = id
-        self.name = name
-        self.description = description
-        self.attributes = attributes
+    id: str
+    name: str
+    description: str
+    attributes: List[SchemaAttribute]
 
-    def dump_obj(self):
+    def dump_obj(self) -> Dict[str, Any]:
         """Returns a JSON-serializable representation of the schema."""
-        pass
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "attributes": [attribute.dump_obj() for attribute in self.attributes],
+        }
+
+
+# Representations returned by Schema.dump_obj and Schema.dump_json, keyed by class
+_dumped_schemas: Dict[type, Dict[str, Any]] = {}
+_dumped_schema_json: Dict[type, bytes] = {}
+
+
+@functools.cache
+def _get_attribute_sub_attributes() -> Tuple[Dict[str, Any], ...]:
+    """Returns the sub-attributes shared by the "attributes" and "subAttributes"
+    attributes of the "Schema" schema, so both reference the same tuple
+    """
+    return (
+        {
+            "name": "name",
+            "type": "string",
+            "multiValued": False,
+            "description": "The attribute's name.",
+            "required": True,
+            "caseExact": True,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "type",
+            "type": "string",
+            "multiValued": False,
+            "description": "The attribute's data type. Valid values include 'string', 'complex', 'boolean', 'decimal', 'integer', 'dateTime', 'reference'.",
+            "required": True,
+            "canonicalValues": [
+                "string",
+                "complex",
+                "boolean",
+                "decimal",
+                "integer",
+                "dateTime",
+                "reference",
+            ],
+            "caseExact": False,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "multiValued",
+            "type": "boolean",
+            "multiValued": False,
+            "description": "A Boolean value indicating an attribute's plurality.",
+            "required": True,
+            "caseExact": False,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "description",
+            "type": "string",
+            "multiValued": False,
+            "description": "A human-readable description of the attribute.",
+            "required": False,
+            "caseExact": True,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "required",
+            "type": "boolean",
+            "multiValued": False,
+            "description": "A boolean value indicating whether or not the attribute is required.",
+            "required": False,
+            "caseExact": False,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "canonicalValues",
+            "type": "string",
+            "multiValued": True,
+            "description": "A collection of canonical values. When applicable, service providers MUST specify the canonical types, e.g., 'work', 'home'.",
+            "required": False,
+            "caseExact": True,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "caseExact",
+            "type": "boolean",
+            "multiValued": False,
+            "description": "A Boolean value indicating whether or not a string attribute is case sensitive.",
+            "required": False,
+            "caseExact": False,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "mutability",
+            "type": "string",
+            "multiValued": False,
+            "description": "Indicates whether or not an attribute is modifiable.",
+            "required": False,
+            "canonicalValues": ["readOnly", "readWrite", "immutable", "writeOnly"],
+            "caseExact": True,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "returned",
+            "type": "string",
+            "multiValued": False,
+            "description": "Indicates whether or not an attribute is returned in a response (e.g., to a query).",
+            "required": False,
+            "canonicalValues": ["always", "never", "default", "request"],
+            "caseExact": True,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "uniqueness",
+            "type": "string",
+            "multiValued": False,
+            "description": "Indicates how unique a value must be.",
+            "required": False,
+            "canonicalValues": ["none", "server", "global"],
+            "caseExact": True,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "referenceTypes",
+            "type": "string",
+            "multiValued": True,
+            "description": "Used only with an attribute of type 'reference'. Specifies a SCIM resourceType that a reference attribute MAY refer to, e.g., 'User'.",
+            "required": False,
+            "caseExact": True,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+    )
+
+
+@functools.cache
+def _get_schema_attributes() -> Tuple[Dict[str, Any], ...]:
+    """Returns the attributes of the "Schema" schema, already in their JSON
+    representation so they don't need to be built from SchemaAttributes and
+    serialized. They're only built the first time a Schema is created.
+    """
+    attribute_sub_attributes = _get_attribute_sub_attributes()
+    return (
+        {
+            "name": "id",
+            "type": "string",
+            "multiValued": False,
+            "description": "The unique URI of the schema. When applicable, service providers MUST specify the URI.",
+            "required": True,
+            "caseExact": False,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "name",
+            "type": "string",
+            "multiValued": False,
+            "description": "The schema's human-readable name. When applicable, service providers MUST specify the name, e.g., 'User'.",
+            "required": True,
+            "caseExact": False,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "description",
+            "type": "string",
+            "multiValued": False,
+            "description": "The schema's human-readable description. When applicable, service providers MUST specify the description.",
+            "required": False,
+            "caseExact": False,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+        },
+        {
+            "name": "attributes",
+            "type": "complex",
+            "multiValued": True,
+            "description": "A complex attribute that includes the attributes of a schema.",
+            "required": True,
+            "caseExact": False,
+            "mutability": "readOnly",
+            "returned": "default",
+            "uniqueness": "none",
+            "subAttributes": attribute_sub_attributes
+            + (
+                {
+                    "name": "subAttributes",
+                    "type": "complex",
+                    "multiValued": True,
+                    "description": "Used to define the sub-attributes of a complex attribute.",
+                    "required": False,
+                    "caseExact": False,
+                    "mutability": "readOnly",
+                    "returned": "default",
+                    "uniqueness": "none",
+                    "subAttributes": attribute_sub_attributes,
+                },
+            ),
+        },
+    )
 
 
 class Schema(SCIMSchema):
     """Defined in https://datatracker.ietf.org/doc/html/rfc7643#section-7"""
 
-    _SCHEMA_ATTRIBUTES = [
-        SchemaAttribute(
-            name="id",
-            type=AttributeType.STRING,
-            multi_valued=False,
-            description="The unique URI of the schema. When applicable, service providers MUST specify the URI.",
-            required=True,
-            case_exact=False,
-            mutability=Mutability.READ_ONLY,
-            returned=Returned.DEFAULT,
-            uniqueness=Uniqueness.NONE,
-        ),
-        SchemaAttribute(
-            name="name",
-            type=AttributeType.STRING,
-            multi_valued=False,
-            description="The schema's human-readable name. When applicable, service providers MUST specify the name, e.g., 'User'.",
-            required=True,
-            case_exact=False,
-            mutability=Mutability.READ_ONLY,
-            returned=Returned.DEFAULT,
-            uniqueness=Uniqueness.NONE,
-        ),
-        SchemaAttribute(
-            name="description",
-            type=AttributeType.STRING,
-            multi_valued=False,
-            description="The schema's human-readable description. When applicable, service providers MUST specify the description.",
-            required=False,
-            case_exact=False,
-            mutability=Mutability.READ_ONLY,
-            returned=Returned.DEFAULT,
-            uniqueness=Uniqueness.NONE,
-        ),
-        SchemaAttribute(
-            name="attributes",
-            type=AttributeType.COMPLEX,
-            multi_valued=True,
-            description="A complex attribute that includes the attributes of a schema.",
-            required=True,
-            mutability=Mutability.READ_ONLY,
-            returned=Returned.DEFAULT,
-            uniqueness=Uniqueness.NONE,
-            sub_attributes=[
-                SchemaAttribute(
-                    name="name",
-                    type=AttributeType.STRING,
-                    multi_valued=False,
-                    description="The attribute's name.",
-                    required=True,
-                    case_exact=True,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                ),
-                SchemaAttribute(
-                    name="type",
-                    type=AttributeType.STRING,
-                    multi_valued=False,
-                    description="The attribute's data type. Valid values include 'string', 'complex', 'boolean', 'decimal', 'integer', 'dateTime', 'reference'.",
-                    required=True,
-                    canonical_values=[
-                        "string",
-                        "complex",
-                        "boolean",
-                        "decimal",
-                        "integer",
-                        "dateTime",
-                        "reference",
-                    ],
-                    case_exact=False,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                ),
-                SchemaAttribute(
-                    name="multiValued",
-                    type=AttributeType.BOOLEAN,
-                    multi_valued=False,
-                    description="A Boolean value indicating an attribute's plurality.",
-                    required=True,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                ),
-                SchemaAttribute(
-                    name="description",
-                    type=AttributeType.STRING,
-                    multi_valued=False,
-                    description="A human-readable description of the attribute.",
-                    required=False,
-                    case_exact=True,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                ),
-                SchemaAttribute(
-                    name="required",
-                    type=AttributeType.BOOLEAN,
-                    multi_valued=False,
-                    description="A boolean value indicating whether or not the attribute is required.",
-                    required=False,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                ),
-                SchemaAttribute(
-                    name="canonicalValues",
-                    type=AttributeType.STRING,
-                    multi_valued=True,
-                    description="A collection of canonical values. When applicable, service providers MUST specify the canonical types, e.g., 'work', 'home'.",
-                    required=False,
-                    case_exact=True,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                ),
-                SchemaAttribute(
-                    name="caseExact",
-                    type=AttributeType.BOOLEAN,
-                    multi_valued=False,
-                    description="A Boolean value indicating whether or not a string attribute is case sensitive.",
-                    required=False,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                ),
-                SchemaAttribute(
-                    name="mutability",
-                    type=AttributeType.STRING,
-                    multi_valued=False,
-                    description="Indicates whether or not an attribute is modifiable.",
-                    required=False,
-                    case_exact=True,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                    canonical_values=[
-                        "readOnly",
-                        "readWrite",
-                        "immutable",
-                        "writeOnly",
-                    ],
-                ),
-                SchemaAttribute(
-                    name="returned",
-                    type=AttributeType.STRING,
-                    multi_valued=False,
-                    description="Indicates whether or not an attribute is returned in a response (e.g., to a query).",
-                    required=False,
-                    case_exact=True,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                    canonical_values=["always", "never", "default", "request"],
-                ),
-                SchemaAttribute(
-                    name="uniqueness",
-                    type=AttributeType.STRING,
-                    multi_valued=False,
-                    description="Indicates how unique a value must be.",
-                    required=False,
-                    case_exact=True,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                    canonical_values=["none", "server", "global"],
-                ),
-                SchemaAttribute(
-                    name="referenceTypes",
-                    type=AttributeType.STRING,
-                    multi_valued=True,
-                    description="Used only with an attribute of type 'reference'. Specifies a SCIM resourceType that a reference attribute MAY refer to, e.g., 'User'.",
-                    required=False,
-                    case_exact=True,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                ),
-                SchemaAttribute(
-                    name="subAttributes",
-                    type=AttributeType.COMPLEX,
-                    multi_valued=True,
-                    description="Used to define the sub-attributes of a complex attribute.",
-                    required=False,
-                    mutability=Mutability.READ_ONLY,
-                    returned=Returned.DEFAULT,
-                    uniqueness=Uniqueness.NONE,
-                    sub_attributes=[
-                        SchemaAttribute(
-                            name="name",
-                            type=AttributeType.STRING,
-                            multi_valued=False,
-                            description="The attribute's name.",
-                            required=True,
-                            case_exact=True,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                        ),
-                        SchemaAttribute(
-                            name="type",
-                            type=AttributeType.STRING,
-                            multi_valued=False,
-                            description="The attribute's data type. Valid values include 'string', 'complex', 'boolean', 'decimal', 'integer', 'dateTime', 'reference'.",
-                            required=True,
-                            canonical_values=[
-                                "string",
-                                "complex",
-                                "boolean",
-                                "decimal",
-                                "integer",
-                                "dateTime",
-                                "reference",
-                            ],
-                            case_exact=False,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                        ),
-                        SchemaAttribute(
-                            name="multiValued",
-                            type=AttributeType.BOOLEAN,
-                            multi_valued=False,
-                            description="A Boolean value indicating an attribute's plurality.",
-                            required=True,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                        ),
-                        SchemaAttribute(
-                            name="description",
-                            type=AttributeType.STRING,
-                            multi_valued=False,
-                            description="A human-readable description of the attribute.",
-                            required=False,
-                            case_exact=True,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                        ),
-                        SchemaAttribute(
-                            name="required",
-                            type=AttributeType.BOOLEAN,
-                            multi_valued=False,
-                            description="A boolean value indicating whether or not the attribute is required.",
-                            required=False,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                        ),
-                        SchemaAttribute(
-                            name="canonicalValues",
-                            type=AttributeType.STRING,
-                            multi_valued=True,
-                            description="A collection of canonical values. When applicable, service providers MUST specify the canonical types, e.g., 'work', 'home'.",
-                            required=False,
-                            case_exact=True,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                        ),
-                        SchemaAttribute(
-                            name="caseExact",
-                            type=AttributeType.BOOLEAN,
-                            multi_valued=False,
-                            description="A Boolean value indicating whether or not a string attribute is case sensitive.",
-                            required=False,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                        ),
-                        SchemaAttribute(
-                            name="mutability",
-                            type=AttributeType.STRING,
-                            multi_valued=False,
-                            description="Indicates whether or not an attribute is modifiable.",
-                            required=False,
-                            case_exact=True,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                            canonical_values=[
-                                "readOnly",
-                                "readWrite",
-                                "immutable",
-                                "writeOnly",
-                            ],
-                        ),
-                        SchemaAttribute(
-                            name="returned",
-                            type=AttributeType.STRING,
-                            multi_valued=False,
-                            description="Indicates whether or not an attribute is returned in a response (e.g., to a query).",
-                            required=False,
-                            case_exact=True,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                            canonical_values=["always", "never", "default", "request"],
-                        ),
-                        SchemaAttribute(
-                            name="uniqueness",
-                            type=AttributeType.STRING,
-                            multi_valued=False,
-                            description="Indicates how unique a value must be.",
-                            required=False,
-                            case_exact=True,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                            canonical_values=["none", "server", "global"],
-                        ),
-                        SchemaAttribute(
-                            name="referenceTypes",
-                            type=AttributeType.STRING,
-                            multi_valued=True,
-                            description="Used only with an attribute of type 'reference'. Specifies a SCIM resourceType that a reference attribute MAY refer to, e.g., 'User'.",
-                            required=False,
-                            case_exact=True,
-                            mutability=Mutability.READ_ONLY,
-                            returned=Returned.DEFAULT,
-                            uniqueness=Uniqueness.NONE,
-                        ),
-                    ],
-                ),
-            ],
-        ),
-    ]
+    __slots__ = ()
 
     def __init__(self):
         self.id = "urn:ietf:params:scim:schemas:core:2.0:Schema"
         self.name = "Schema"
         self.description = "Specifies the schema that describes a SCIM schema"
-        self.attributes = self._SCHEMA_ATTRIBUTES
+        self.attributes = _get_schema_attributes()
+
+    def dump_obj(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable representation of the schema.
+        It never changes, so it's built once per class and shared between calls;
+        callers must not modify it.
+        """
+        dumped = _dumped_schemas.get(type(self))
+        if dumped is None:
+            dumped = _dumped_schemas.setdefault(
+                type(self),
+                {
+                    "id": self.id,
+                    "name": self.name,
+                    "description": self.description,
+                    "attributes": self.attributes,
+                },
+            )
+        return dumped
+
+    def dump_json(self) -> bytes:
+        """Returns the schema serialized to JSON.
+        Like dump_obj, it's only serialized once per class.
+        """
+        dumped = _dumped_schema_json.get(type(self))
+        if dumped is None:
+            dumped = _dumped_schema_json.setdefault(
+                type(self), dump_json(self.dump_obj())
+            )
+        return dumped
 
 
 def to_camel_case(snake_case_string):
@@ -482,82 +609,156 @@ def to_camel_case(snake_case_string):
     return components[0] + "".join(x.title() for x in components[1:])
 
 
-class User(SCIMSchema):
-    def __init__(
-        self,
-        *,
-        id: str,
-        user_name: str,
-        formatted: str = None,
-        family_name: str = None,
-        given_name: str = None,
-        middle_name: str = None,
-        honorific_prefix: str = None,
-        honorific_suffix: str = None,
-        display_name: str = None,
-        nick_name: str = None,
-        profile_url: str = None,
-        title: str = None,
-        userType: str = None,
-        preferred_language: str = None,
-        locale: str = None,
-        timezone: str = None,
-        active: str = None,
-        password: str = None,
-        emails: List[str] = None,
-        phone_numbers: List[str] = None,
-        ims: List[str] = None,
-        photos: List[str] = None,
-        addresses: List[str] = None,
-        groups: List[str] = None,
-        entitlements: List[str] = None,
-        roles: List[str] = None,
-        x509_certificates: List[str] = None,
-    ):
-        self.id = id
-        self.schemas = ["urn:ietf:params:scim:schemas:core:2.0:User"]
-
-        self.user_name = user_name
-        self.formatted = formatted
-        self.family_name = family_name
-        self.given_name = given_name
-        self.middle_name = middle_name
-        self.honorific_prefix = honorific_prefix
-        self.honorific_suffix = honorific_suffix
-        self.display_name = display_name
-        self.nick_name = nick_name
-        self.profile_url = profile_url
-        self.title = title
-        self.userType = userType
-        self.preferred_language = preferred_language
-        self.locale = locale
-        self.timezone = timezone
-        self.active = active
-        self.password = password
-        self.emails = emails
-        self.phone_numbers = phone_numbers
-        self.ims = ims
-        self.photos = photos
-        self.addresses = addresses
-        self.groups = groups
-        self.entitlements = entitlements
-        self.roles = roles
-        self.x509_certificates = x509_certificates
+# Generated json_encode implementations, keyed by SCIMResource subclass
+_resource_encoders: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def _generate_resource_encoder(
+    resource_class: type,
+) -> Callable[[Any], Dict[str, Any]]:
+    """Generates a function that JSON-encodes instances of a SCIMResource dataclass,
+    reading each field with a plain attribute access instead of looping over fields().
+    A class-level schemas tuple is emitted first. Fields defaulting to None are
+    skipped when None, multi-valued fields defaulting to () are skipped when empty,
+    and the rest are always set. Fields starting with "_" are internal and left out.
+    """
+    schemas = getattr(resource_class, "schemas", None)
+    if schemas is None:
+        lines = ["def encode(resource):", "    jsonified = {}"]
+    else:
+        # Class-level, so written as a literal rather than read from the instance
+        lines = [
+            "def encode(resource):",
+            f"    jsonified = {{'schemas': {list(schemas)!r}}}",
+        ]
+    for resource_field in fields(resource_class):
+        if resource_field.name.startswith("_"):
+            continue
+        key = to_camel_case(resource_field.name)
+        if resource_field.default is None:
+            lines.append(f"    v = resource.{resource_field.name}")
+            lines.append("    if v is not None:")
+            lines.append(f"        jsonified[{key!r}] = v")
+        elif resource_field.default == ():
+            lines.append(f"    v = resource.{resource_field.name}")
+            lines.append("    if v:")
+            lines.append(f"        jsonified[{key!r}] = v")
+        else:
+            lines.append(f"    jsonified[{key!r}] = resource.{resource_field.name}")
+    lines.append("    return jsonified")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["encode"]
+
+
+class SCIMResource:
+    """A mixin for SCIM resources, e.g. Users and Groups"""
+
+    __slots__ = ()
 
     def json_encode(self):
-        jsonified = {}
-        for k, v in self.__dict__.items():
-            if v is None:
-                continue
-            jsonified[to_camel_case(k)] = v
-        return jsonified
+        encoder = _resource_encoders.get(type(self))
+        if encoder is None:
+            encoder = _resource_encoders.setdefault(
+                type(self), _generate_resource_encoder(type(self))
+            )
+        return encoder(self)
+
+    def dump_json(self) -> bytes:
+        """Returns the resource serialized to JSON"""
+        return dump_json(self)
 
 
+@dataclass(frozen=True, kw_only=True, slots=True)
+class User(SCIMResource):
+    """Users are immutable, so their JSON can be cached. Change one with
+    dataclasses.replace, which builds a new user with an empty cache.
+    """
+
+    endpoint: ClassVar[str] = "/Users"
+
+    schemas: ClassVar[Tuple[str, ...]] = ("urn:ietf:params:scim:schemas:core:2.0:User",)
+    id: str
+    user_name: str
+    formatted: str = None
+    family_name: str = None
+    given_name: str = None
+    middle_name: str = None
+    honorific_prefix: str = None
+    honorific_suffix: str = None
+    display_name: str = None
+    nick_name: str = None
+    profile_url: str = None
+    title: str = None
+    userType: str = None
+    preferred_language: str = None
+    locale: str = None
+    timezone: str = None
+    active: str = None
+    password: str = field(default=None, repr=False)
+    emails: Tuple[str, ...] = ()
+    phone_numbers: Tuple[str, ...] = ()
+    ims: Tuple[str, ...] = ()
+    photos: Tuple[str, ...] = ()
+    addresses: Tuple[str, ...] = ()
+    groups: Tuple[str, ...] = ()
+    entitlements: Tuple[str, ...] = ()
+    roles: Tuple[str, ...] = ()
+    x509_certificates: Tuple[str, ...] = ()
+    # Set by the first dump_json call; users are frozen, so it never goes stale
+    _json: bytes = field(default=None, init=False, repr=False, compare=False)
+
+    _MULTI_VALUED_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "emails",
+        "phone_numbers",
+        "ims",
+        "photos",
+        "addresses",
+        "groups",
+        "entitlements",
+        "roles",
+        "x509_certificates",
+    )
+
+    def __post_init__(self):
+        self._freeze_multi_valued_fields()
+        self._intern_shared_values()
+
+    def dump_json(self) -> bytes:
+        """Returns the user serialized to JSON.
+        It's only serialized on the first call.
+        """
+        if self._json is None:
+            object.__setattr__(self, "_json", dump_json(self))
+        return self._json
+
+    def _freeze_multi_valued_fields(self):
+        # Stored as tuples so in-place changes can't make the cached JSON stale
+        for name in self._MULTI_VALUED_FIELDS:
+            value = getattr(self, name)
+            if type(value) is not tuple:
+                object.__setattr__(self, name, tuple(value))
+
+    def _intern_shared_values(self):
+        # These take a handful of values shared by many users, so interning
+        # keeps one copy of each rather than one per user
+        if self.userType is not None:
+            object.__setattr__(self, "userType", _intern(self.userType))
+        if self.preferred_language is not None:
+            object.__setattr__(
+                self, "preferred_language", _intern(self.preferred_language)
+            )
+        if self.locale is not None:
+            object.__setattr__(self, "locale", _intern(self.locale))
+        if self.timezone is not None:
+            object.__setattr__(self, "timezone", _intern(self.timezone))
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
 class Manager:
-    def __init__(self, *, value: str, ref: str, display_name: str):
-        self.value = value
-        self.ref = ref
-        self.display_name = display_name
+    value: str
+    ref: str
+    display_name: str
 
 
 # class EnterpriseUser(Schema):
@@ -572,17 +773,13 @@ class Manager:
 #         manager: Dict[str, str]
 
 
-class Group(Schema):
-    def __init__(
-        self,
-        *,
-        display_name: str,
-        members: List[str] = None,
-    ):
-        self.id = "urn:ietf:params:scim:schemas:core:2.0:Group"
-        self.name = "Group"
-        self.description = "Group"
-        self.endpoint = "/Groups"
-
-        self.display_name = display_name
-        self.members = members
+@dataclass(kw_only=True, slots=True)
+class Group(SCIMResource):
+    endpoint: ClassVar[str] = "/Groups"
+
+    schemas: ClassVar[Tuple[str, ...]] = (
+        "urn:ietf:params:scim:schemas:core:2.0:Group",
+    )
+    id: str
+    display_name: str
+    members: Tuple[str, ...] = ()
@@ -1,3 +1,5 @@
+import dataclasses
+import json
 import unittest
 
 import scim_utilities
@@ -15,6 +17,216 @@ class TestSCIMUtilities(unittest.TestCase):
         }
         self.assertDictEqual(user_json, expected)
 
+    def test_dump_json_user(self):
+        user = scim_utilities.User(id="test@test.com", user_name="test@test.com")
+
+        self.assertEqual(
+            json.loads(scim_utilities.dump_json([user])), [user.json_encode()]
+        )
+
+    def test_user_shared_values_interned(self):
+        users = [
+            scim_utilities.User(
+                id=str(i), user_name=str(i), userType="".join("Employee")
+            )
+            for i in range(2)
+        ]
+        self.assertIs(users[0].userType, users[1].userType)
+
+        user = scim_utilities.User(
+            id="a", user_name="a", userType=scim_utilities.ReferenceTypes.USER
+        )
+        self.assertIs(user.userType, scim_utilities.ReferenceTypes.USER)
+
+    def test_user_dump_json_cached(self):
+        user = scim_utilities.User(id="test@test.com", user_name="test@test.com")
+        dumped = user.dump_json()
+
+        self.assertIs(user.dump_json(), dumped)
+        self.assertNotIn("Json", user.json_encode())
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            user.display_name = "Test"
+        user = dataclasses.replace(user, display_name="Test", emails=["a@test.com"])
+        self.assertEqual(json.loads(user.dump_json())["displayName"], "Test")
+        self.assertEqual(user.emails, ("a@test.com",))
+
+    def test_group_json_encode(self):
+        group = scim_utilities.Group(id="admins", display_name="Admins")
+
+        self.assertEqual(
+            group.json_encode(),
+            {
+                "schemas": ["urn:ietf:params:scim:schemas:core:2.0:Group"],
+                "id": "admins",
+                "displayName": "Admins",
+            },
+        )
+
+    def test_create_base_list_response(self):
+        resources = [{"id": "test@test.com"}]
+        list_response = scim_utilities.create_base_list_response(resources)
+
+        expected = {
+            "schemas": ["urn:ietf:params:scim:api:messages:2.0:ListResponse"],
+            "totalResults": 1,
+            "Resources": resources,
+        }
+        self.assertEqual(json.loads(json.dumps(list_response)), expected)
+
+    def test_create_base_list_response_total(self):
+        list_response = scim_utilities.create_base_list_response(
+            (resource for resource in [{"id": "a"}, {"id": "b"}])
+        )
+        self.assertEqual(list_response["totalResults"], 2)
+        self.assertEqual(list(list_response["Resources"]), [{"id": "a"}, {"id": "b"}])
+
+        list_response = scim_utilities.create_base_list_response([{"id": "a"}], 10)
+        self.assertEqual(list_response["totalResults"], 10)
+
+        list_response = scim_utilities.create_base_list_response(
+            (resource for resource in [{"id": "a"}]), 10
+        )
+        self.assertEqual(
+            json.loads(scim_utilities.dump_json(list_response))["Resources"],
+            [{"id": "a"}],
+        )
+
+    def test_create_base_list_response_page(self):
+        resources = [{"id": str(i)} for i in range(5)]
+        list_response = scim_utilities.create_base_list_response(
+            resources, start_index=2, count=2
+        )
+
+        self.assertEqual(list_response["totalResults"], 5)
+        self.assertEqual(list_response["itemsPerPage"], 2)
+        self.assertEqual(list_response["startIndex"], 2)
+        self.assertEqual(list(list_response["Resources"]), [{"id": "1"}, {"id": "2"}])
+
+        list_response = scim_utilities.create_base_list_response(
+            {"a", "b", "c"}, start_index=2
+        )
+        self.assertEqual(list_response["totalResults"], 3)
+        self.assertEqual(len(list_response["Resources"]), 2)
+
+        list_response = scim_utilities.create_base_list_response(
+            resources, start_index=-3, count=-1
+        )
+        self.assertEqual(list_response["startIndex"], 1)
+        self.assertEqual(list_response["itemsPerPage"], 0)
+        self.assertEqual(list(list_response["Resources"]), [])
+
+        list_response = scim_utilities.create_base_list_response(resources)
+        self.assertNotIn("startIndex", list_response)
+        self.assertNotIn("itemsPerPage", list_response)
+
+    def test_dump_list_response_json(self):
+        resources = [
+            scim_utilities.User(id="a@test.com", user_name="a@test.com"),
+            scim_utilities.User(id="b@test.com", user_name="b@test.com"),
+        ]
+        list_response = scim_utilities.create_base_list_response(resources)
+
+        self.assertEqual(
+            json.loads(scim_utilities.dump_list_response_json(resources)),
+            json.loads(scim_utilities.dump_json(list_response)),
+        )
+        self.assertEqual(
+            json.loads(scim_utilities.dump_list_response_json([]))["Resources"], []
+        )
+        self.assertEqual(
+            json.loads(
+                scim_utilities.dump_list_response_json(
+                    resources, start_index=2, count=5
+                )
+            ),
+            json.loads(
+                scim_utilities.dump_json(
+                    scim_utilities.create_base_list_response(
+                        resources, start_index=2, count=5
+                    )
+                )
+            ),
+        )
+        list_response = json.loads(
+            scim_utilities.dump_list_response_json(
+                (resource for resource in resources), start_index=2, count=-1
+            )
+        )
+        self.assertEqual(list_response["totalResults"], 2)
+        self.assertEqual(list_response["itemsPerPage"], 0)
+        self.assertEqual(list_response["startIndex"], 2)
+        self.assertEqual(list_response["Resources"], [])
+
+    def test_enum_json_encode(self):
+        self.assertEqual(json.dumps(scim_utilities.Mutability.READ_ONLY), '"readOnly"')
+
+    def test_schema_attribute_required(self):
+        attribute = scim_utilities.SchemaAttribute(
+            name="userName", multi_valued=False, description="", required=True
+        )
+        self.assertTrue(attribute.required)
+        self.assertFalse(hasattr(attribute, "__dict__"))
+
+    def test_schema_attribute_enum_canonical_values(self):
+        canonical_values = [
+            scim_utilities.Mutability.READ_ONLY,
+            scim_utilities.Mutability.READ_WRITE,
+        ]
+        attribute = scim_utilities.SchemaAttribute(
+            name="mutability",
+            multi_valued=False,
+            description="",
+            canonical_values=canonical_values,
+        )
+
+        self.assertEqual(attribute.canonical_values, tuple(canonical_values))
+
+    def test_sub_attributes_without_complex_type(self):
+        sub_attribute = scim_utilities.SchemaAttribute(
+            name="value", multi_valued=False, description="", required=False
+        )
+        with self.assertRaisesRegex(
+            scim_utilities.SCIMViolation, 'Attribute "emails" has sub-attributes'
+        ):
+            scim_utilities.SchemaAttribute(
+                name="emails",
+                multi_valued=True,
+                description="",
+                required=False,
+                sub_attributes=[sub_attribute],
+            )
+
+    def test_schema_attribute_dump_obj(self):
+        attribute = scim_utilities.SchemaAttribute(
+            name="userName", multi_valued=False, description="", required=True
+        )
+        dumped = attribute.dump_obj()
+
+        self.assertEqual(dumped["name"], "userName")
+        self.assertIs(attribute.dump_obj(), dumped)
+        self.assertEqual(
+            attribute,
+            scim_utilities.SchemaAttribute(
+                name="userName", multi_valued=False, description="", required=True
+            ),
+        )
+
+    def test_schema_dump_obj(self):
+        dumped = scim_utilities.Schema().dump_obj()
+
+        self.assertEqual(dumped["id"], "urn:ietf:params:scim:schemas:core:2.0:Schema")
+        self.assertEqual(
+            [attribute["name"] for attribute in dumped["attributes"]],
+            ["id", "name", "description", "attributes"],
+        )
+        self.assertIs(scim_utilities.Schema().dump_obj(), dumped)
+
+    def test_schema_attributes_shared(self):
+        self.assertIsInstance(scim_utilities.Schema().attributes, tuple)
+        self.assertIs(
+            scim_utilities.Schema().attributes, scim_utilities.Schema().attributes
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,11 +1,12 @@
-import json
-
-from scim_system import SCIMSystem
+from scim_system import cached_response, SCIMSystem
 import scim_utilities
 
 
 class Example(SCIMSystem):
-    users = [scim_utilities.User(user_name="bob")]
+    users = [scim_utilities.User(id="bob", user_name="bob")]
+    # Bumped by anything changing users, so get_users re-serializes them
+    users_version = 0
 
+    @cached_response("users_version")
     def get_users(self):
-        return json.dumps(self.users)
+        return scim_utilities.dump_list_response_json(self.users)